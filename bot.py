@@ -3,17 +3,32 @@ import time
 import math
 import asyncio
 import logging
+import random
+import secrets
+import threading
 import base64  # Missing import
-from functools import wraps
+from collections import deque
+from functools import partial, wraps
 from urllib.parse import quote
 
-import boto3
-from botocore.exceptions import ClientError
+from botocore.exceptions import BotoCoreError, ClientError
 from pyrogram import Client, filters
+from pyrogram.enums import MessageMediaType
+from pyrogram.errors import FloodWait
 from pyrogram.types import Message
 
+try:
+    # uvloop's libuv event loop; must be installed before the Client is created
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
+
 # Import configuration
 from config import config
+from clients import (
+    MAX_IN_MEMORY_PARTS, PART_SIZE, TRANSFER_CONFIG, TRANSFER_EXECUTOR, presign_get_url, s3_client
+)
 
 # --- Configuration ---
 # Set up basic logging
@@ -24,41 +39,42 @@ logger = logging.getLogger(__name__)
 API_ID = config.API_ID
 API_HASH = config.API_HASH
 BOT_TOKEN = config.BOT_TOKEN
-WASABI_ACCESS_KEY = config.WASABI_ACCESS_KEY
-WASABI_SECRET_KEY = config.WASABI_SECRET_KEY
 WASABI_BUCKET = config.WASABI_BUCKET
 WASABI_REGION = config.WASABI_REGION
-ADMIN_ID = config.ADMIN_ID
+ADMIN_IDS = config.ADMIN_IDS
 
 # Player URL configuration - Using Render URL
 RENDER_URL = os.getenv("RENDER_URL", "http://localhost:8000")
 SUPPORTED_VIDEO_FORMATS = {'.mp4', '.mkv', '.avi', '.mov', '.wmv', '.flv', '.webm', '.m4v', '.3gp', '.mpeg', '.mpg'}
 
-# In-memory storage for authorized user IDs. Starts with the admin.
+# In-memory storage for authorized user IDs. Starts with the admins.
 # For persistence, consider using a database or a file.
-ALLOWED_USERS = {ADMIN_ID}
+ALLOWED_USERS = set(ADMIN_IDS)
 
 # --- Bot & Wasabi Client Initialization ---
-app = Client("wasabi_bot", api_id=API_ID, api_hash=API_HASH, bot_token=BOT_TOKEN)
-
-# Boto3 S3 client for Wasabi
+# Allow several file segments (across all uploads) to be fetched from Telegram at once
+MAX_CONCURRENT_TRANSMISSIONS = 8
+# Each upload holds a handler worker for its whole transfer; keep enough spare
+# that commands and callbacks are still served while large files stream
+UPDATE_WORKERS = 32
+app = Client(
+    "wasabi_bot",
+    api_id=API_ID,
+    api_hash=API_HASH,
+    bot_token=BOT_TOKEN,
+    max_concurrent_transmissions=MAX_CONCURRENT_TRANSMISSIONS,
+    workers=UPDATE_WORKERS,
+    # Bots re-authorize from the token, so the session never needs to hit disk
+    in_memory=True
+)
+
+# Boto3 S3 client for Wasabi, shared process-wide via clients.py
 try:
-    s3_client = boto3.client(
-        's3',
-        endpoint_url=f'https://s3.{WASABI_REGION}.wasabisys.com',
-        aws_access_key_id=WASABI_ACCESS_KEY,
-        aws_secret_access_key=WASABI_SECRET_KEY,
-        region_name=WASABI_REGION,
-        config=boto3.session.Config(
-            s3={'addressing_style': 'virtual'},
-            retries={'max_attempts': 3, 'mode': 'standard'}
-        )
-    )
     # Test connection
     s3_client.head_bucket(Bucket=WASABI_BUCKET)
     logger.info("Successfully connected to Wasabi.")
 except Exception as e:
-    logger.error(f"Failed to connect to Wasabi: {e}")
+    logger.error("Failed to connect to Wasabi: %s", e)
     s3_client = None
 
 # --- Helpers & Decorators ---
@@ -66,7 +82,7 @@ def is_admin(func):
     """Decorator to check if the user is the admin."""
     @wraps(func)
     async def wrapper(client, message):
-        if message.from_user.id == ADMIN_ID:
+        if message.from_user.id in ADMIN_IDS:
             await func(client, message)
         else:
             await message.reply_text("⛔️ Access denied. This command is for the admin only.")
@@ -82,18 +98,16 @@ def is_authorized(func):
             await message.reply_text("⛔️ You are not authorized to use this bot. Contact the admin.")
     return wrapper
 
+SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
 def humanbytes(size):
     """Converts bytes to a human-readable format."""
     if not size:
         return "0B"
     size = int(size)
-    power = 1024
-    n = 0
-    power_labels = {0: '', 1: 'K', 2: 'M', 3: 'G', 4: 'T'}
-    while size > power and n < len(power_labels) -1 :
-        size /= power
-        n += 1
-    return f"{size:.2f} {power_labels[n]}B"
+    # Each unit step is 2**10, so the unit index falls out of the bit length
+    n = min((size.bit_length() - 1) // 10, len(SIZE_UNITS) - 1)
+    return f"{size / (1 << (10 * n)):.2f} {SIZE_UNITS[n]}"
 
 def get_file_extension(filename):
     """Extract file extension in lowercase."""
@@ -122,24 +136,17 @@ def generate_player_url(filename, presigned_url):
     return None
 
 # --- Progress Callback Management ---
-last_update_time = {}
+PROGRESS_INTERVAL = 2  # Minimum seconds between progress edits of one message
+# Only 21 distinct bars exist (one per 5%), so build them all up front
+PROGRESS_BARS = tuple(f"[{'█' * i}{' ' * (20 - i)}]" for i in range(21))
 
 async def progress_callback(current, total, message, status):
-    """Updates the progress message in Telegram."""
-    chat_id = message.chat.id
-    message_id = message.id
-    
-    # Throttle updates to avoid hitting Telegram API limits
-    now = time.time()
-    if (now - last_update_time.get(message_id, 0)) < 2 and current != total:
-        return
-    last_update_time[message_id] = now
+    """Updates the progress message in Telegram.
 
+    Returns how many seconds Telegram asked us to wait before the next edit.
+    """
     percentage = current * 100 / total
-    progress_bar = "[{0}{1}]".format(
-        '█' * int(percentage / 5),
-        ' ' * (20 - int(percentage / 5))
-    )
+    progress_bar = PROGRESS_BARS[min(int(percentage / 5), 20)]
     
     details = (
         f"**{status}**\n"
@@ -150,98 +157,304 @@ async def progress_callback(current, total, message, status):
     )
     
     try:
-        await app.edit_message_text(chat_id, message_id, text=details)
+        await app.edit_message_text(message.chat.id, message.id, text=details)
+    except FloodWait as e:
+        logger.warning("Progress edits paused for %ss by Telegram flood control", e.value)
+        return e.value
     except Exception as e:
-        logger.warning(f"Failed to edit message: {e}")
+        logger.warning("Failed to edit message: %s", e)
+    return 0
+
+async def edit_with_retry(message, text, max_attempts=3, **kwargs):
+    """Edit a message, waiting out Telegram FloodWait errors between attempts."""
+    for attempt in range(max_attempts):
+        try:
+            return await message.edit_text(text, **kwargs)
+        except FloodWait as e:
+            if attempt == max_attempts - 1:
+                raise
+            await asyncio.sleep(e.value + random.uniform(0, 1))
+
+async def edit_interim(message, text):
+    """Best-effort interim status edit; a failure is logged, never raised."""
+    try:
+        await message.edit_text(text)
+    except Exception as e:
+        logger.warning("Failed to edit message: %s", e)
 
 # --- Enhanced S3 Operations ---
-async def upload_to_wasabi(file_path, file_name, status_message):
+# Files are streamed from Telegram straight into Wasabi, so nothing is staged
+# on local disk. boto3's transfer manager (see clients.TRANSFER_CONFIG) splits
+# the stream into parts and uploads them concurrently, retrying and aborting
+# failed uploads itself.
+
+# Telegram serves files in 1MB chunks; a single sequential stream fetches them
+# one request at a time, so the file is downloaded as small segments with
+# several in flight at once. Segments are independent of PART_SIZE: read-ahead
+# is at most PARALLEL_SEGMENTS * SEGMENT_SIZE (16MB), on top of the one part
+# being assembled for boto3.
+TELEGRAM_CHUNK_SIZE = 1024 * 1024
+SEGMENT_CHUNKS = 4
+SEGMENT_SIZE = SEGMENT_CHUNKS * TELEGRAM_CHUNK_SIZE
+PARALLEL_SEGMENTS = 4
+# Below this a file is fetched into memory and sent with a single PutObject
+SMALL_FILE_SIZE = 5 * 1024 * 1024
+
+# Each streamed upload buffers up to MAX_IN_MEMORY_PARTS + 1 parts inside
+# s3transfer, one more part being assembled from segments, and its segment
+# read-ahead: 116MB with the defaults. Uploads are admitted only while their
+# total fits UPLOAD_MEMORY_BUDGET_MB (two at the default 256MB); a burst of
+# files waits here rather than with progress trackers already running. Small
+# files take the single PutObject path and never wait for a slot.
+UPLOAD_MEMORY_PER_FILE = (
+    (MAX_IN_MEMORY_PARTS + 2) * PART_SIZE
+    + (PARALLEL_SEGMENTS + 1) * SEGMENT_SIZE
+)
+UPLOAD_SEMAPHORE = asyncio.Semaphore(
+    max(1, config.UPLOAD_MEMORY_BUDGET_MB * 1024 * 1024 // UPLOAD_MEMORY_PER_FILE)
+)
+
+class TelegramStream:
+    """Blocking file-like reader over a Telegram file for boto3.
+
+    Segments are fetched concurrently with client.stream_media() on the event
+    loop and handed out in order. boto3 reads the body from its worker
+    threads; each read hands the chunk fetching to the event loop and waits
+    for it. Chunks are kept as-is and joined once per read, so a part is
+    copied a single time on its way out.
+    """
+
+    def __init__(self, client, message, file_size, loop):
+        self._client = client
+        self._message = message
+        self._loop = loop
+        self._file_size = file_size
+        self._segment_count = max(1, math.ceil(file_size / SEGMENT_SIZE))
+        self._next_segment = 0
+        self._segments = deque()
+        self._pending = deque()
+        self._buffered = 0
+        self._eof = False
+
+    async def _download_segment(self, index):
+        chunks = [
+            chunk async for chunk in self._client.stream_media(
+                self._message,
+                offset=index * SEGMENT_CHUNKS,
+                limit=SEGMENT_CHUNKS
+            )
+        ]
+        # Pyrogram ends the stream early on errors it handles itself (such as a
+        # long FloodWait); a short segment would leave a hole mid-file
+        expected = min(SEGMENT_SIZE, self._file_size - index * SEGMENT_SIZE)
+        received = sum(map(len, chunks))
+        if received != expected:
+            raise IOError(
+                f"Telegram returned {received} of {expected} bytes for segment {index}"
+            )
+        return chunks
+
+    def _schedule_segments(self):
+        while len(self._segments) < PARALLEL_SEGMENTS and self._next_segment < self._segment_count:
+            self._segments.append(
+                asyncio.create_task(self._download_segment(self._next_segment))
+            )
+            self._next_segment += 1
+
+    async def _fill(self, size):
+        # Runs on the event loop and gathers a whole read's worth of chunks, so
+        # boto3's thread crosses over to the loop once per part, not per chunk.
+        while not self._eof and (size < 0 or self._buffered < size):
+            self._schedule_segments()
+            if not self._segments:
+                self._eof = True
+                break
+            chunks = await self._segments.popleft()
+            self._pending.extend(chunks)
+            self._buffered += sum(map(len, chunks))
+
+    def read(self, size=-1):
+        if not self._eof and (size < 0 or self._buffered < size):
+            asyncio.run_coroutine_threadsafe(self._fill(size), self._loop).result()
+
+        if size < 0 or size >= self._buffered:
+            data = b"".join(self._pending)
+            self._pending.clear()
+            self._buffered = 0
+            return data
+
+        parts = []
+        remaining = size
+        while remaining:
+            chunk = self._pending.popleft()
+            if len(chunk) > remaining:
+                # Split without copying; the tail stays queued as a view
+                view = memoryview(chunk)
+                parts.append(view[:remaining])
+                self._pending.appendleft(view[remaining:])
+                remaining = 0
+            else:
+                parts.append(chunk)
+                remaining -= len(chunk)
+        self._buffered -= size
+        return b"".join(parts)
+
+    async def aclose(self):
+        for segment in self._segments:
+            segment.cancel()
+        self._segments.clear()
+
+class ProgressTracker:
+    """boto3 transfer callback that reports upload progress to Telegram.
+
+    boto3 invokes the tracker from its worker threads, so a call only adds to
+    a counter; a single task on the event loop turns that counter into at most
+    one message edit every PROGRESS_INTERVAL seconds.
+    """
+
+    __slots__ = ("total", "message", "status", "_lock", "_counter", "_task")
+
+    def __init__(self, total, message, status):
+        self.total = total
+        self.message = message
+        self.status = status
+        self._lock = threading.Lock()
+        self._counter = 0
+        self._task = None
+
+    def __call__(self, bytes_amount):
+        with self._lock:
+            self._counter += bytes_amount
+
+    async def _editor_loop(self):
+        reported = 0
+        while True:
+            await asyncio.sleep(PROGRESS_INTERVAL)
+            current = self._counter
+            if current != reported:
+                # Progress is disposable: sit out a flood wait instead of queueing edits
+                await asyncio.sleep(
+                    await progress_callback(current, self.total, self.message, self.status)
+                )
+                reported = current
+
+    def start(self):
+        self._task = asyncio.create_task(self._editor_loop())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+
+async def upload_to_wasabi(client, message, file_name, file_size, status_message, mime_type=None):
     """Upload file to Wasabi with retry logic and progress tracking."""
     max_retries = 3
     base_delay = 2
+    # Stored Content-Type lets browsers and players stream the link inline
+    extra_args = {'ContentType': mime_type} if mime_type else {}
+    # Small files finish in one request; skip segments, multipart and progress
+    small_file = file_size < SMALL_FILE_SIZE
     
     for attempt in range(max_retries):
+        loop = asyncio.get_running_loop()
+        stream = progress_tracker = None
+        if not small_file:
+            await UPLOAD_SEMAPHORE.acquire()
+            stream = TelegramStream(client, message, file_size, loop)
+            progress_tracker = ProgressTracker(
+                file_size,
+                status_message,
+                f"Uploading... (Attempt {attempt + 1}/{max_retries})"
+            )
+            progress_tracker.start()
         try:
-            loop = asyncio.get_event_loop()
-            
-            class ProgressTracker:
-                def __init__(self):
-                    self.uploaded = 0
-                    self.file_size = os.path.getsize(file_path)
-                
-                def __call__(self, bytes_amount):
-                    self.uploaded += bytes_amount
-                    # Use thread-safe coroutine execution
-                    asyncio.run_coroutine_threadsafe(
-                        progress_callback(
-                            self.uploaded, 
-                            self.file_size, 
-                            status_message, 
-                            f"Uploading... (Attempt {attempt + 1}/{max_retries})"
-                        ),
-                        loop
+            try:
+                if small_file:
+                    data = await client.download_media(message, in_memory=True)
+                    body = data.getvalue() if data else b""
+                    if len(body) != file_size:
+                        raise IOError(f"Telegram returned {len(body)} of {file_size} bytes")
+                    await loop.run_in_executor(
+                        None,
+                        partial(
+                            s3_client.put_object,
+                            Bucket=WASABI_BUCKET,
+                            Key=file_name,
+                            Body=body,
+                            **extra_args
+                        )
                     )
-            
-            progress_tracker = ProgressTracker()
-            
-            # Upload file using threads
-            await loop.run_in_executor(
-                None,
-                lambda: s3_client.upload_file(
-                    file_path,
-                    WASABI_BUCKET,
-                    file_name,
-                    Callback=progress_tracker
-                )
-            )
+                else:
+                    await loop.run_in_executor(
+                        TRANSFER_EXECUTOR,
+                        partial(
+                            s3_client.upload_fileobj,
+                            stream,
+                            WASABI_BUCKET,
+                            file_name,
+                            ExtraArgs=extra_args,
+                            Config=TRANSFER_CONFIG,
+                            Callback=progress_tracker
+                        )
+                    )
+            finally:
+                # Stop before any retry notice, so a stale progress edit can't
+                # overwrite it and no segments download during the backoff
+                if progress_tracker:
+                    progress_tracker.stop()
+                    await stream.aclose()
+                    UPLOAD_SEMAPHORE.release()
             return True
             
-        except ClientError as e:
-            error_code = e.response['Error']['Code']
-            logger.warning(f"Upload attempt {attempt + 1} failed: {error_code}")
+        except (ClientError, BotoCoreError) as e:
+            # Timeouts and dropped connections surface as BotoCoreError once
+            # botocore's own retries run out
+            error_code = e.response['Error']['Code'] if isinstance(e, ClientError) else type(e).__name__
+            logger.warning("Upload attempt %d failed: %s", attempt + 1, error_code)
             
             if attempt == max_retries - 1:  # Last attempt
                 raise e
                 
-            # Exponential backoff
-            delay = base_delay * (2 ** attempt)
-            await status_message.edit_text(
-                f"⚠️ Upload failed (attempt {attempt + 1}/{max_retries}). "
-                f"Retrying in {delay} seconds..."
+            # Exponential backoff with jitter
+            delay = base_delay * (2 ** attempt) + random.uniform(0, base_delay)
+            # The notice is sent during the backoff, not before it
+            await asyncio.gather(
+                edit_interim(
+                    status_message,
+                    f"⚠️ Upload failed (attempt {attempt + 1}/{max_retries}). "
+                    f"Retrying in {delay:.0f} seconds..."
+                ),
+                asyncio.sleep(delay)
             )
-            await asyncio.sleep(delay)
     
     return False
 
+PRESIGNED_URL_EXPIRY = 604800  # 7 days
+
 async def generate_presigned_url(file_name):
     """Generate presigned URL with error handling."""
     try:
-        return s3_client.generate_presigned_url(
-            'get_object',
-            Params={'Bucket': WASABI_BUCKET, 'Key': file_name},
-            ExpiresIn=604800  # 7 days
+        # Signing is synchronous boto3 work; keep it off the event loop
+        return await asyncio.get_running_loop().run_in_executor(
+            None, presign_get_url, WASABI_BUCKET, file_name, PRESIGNED_URL_EXPIRY
         )
     except ClientError as e:
-        logger.error(f"Failed to generate presigned URL: {e}")
+        logger.error("Failed to generate presigned URL: %s", e)
         return None
 
-# --- Bot Command Handlers ---
-@app.on_message(filters.command("start"))
-async def start_handler(client: Client, message: Message):
-    await message.reply_text(
-        f"👋 Welcome!\n\nThis bot can upload files to Wasabi storage.\n"
-        f"Your User ID is: `{message.from_user.id}`\n\n"
-        "Send me any file if you are an authorized user.\n\n"
-        "**Features:**\n"
-        "• Direct download links\n"
-        "• Video player URLs for streaming\n"
-        "• Progress tracking\n"
-        "• 7-day link validity"
-    )
-
-@app.on_message(filters.command("help"))
-async def help_handler(client: Client, message: Message):
-    help_text = """
+# --- Static Bot Messages ---
+# Built once at import; /start only fills in the user's ID
+START_TEXT = (
+    "👋 Welcome!\n\nThis bot can upload files to Wasabi storage.\n"
+    "Your User ID is: `{user_id}`\n\n"
+    "Send me any file if you are an authorized user.\n\n"
+    "**Features:**\n"
+    "• Direct download links\n"
+    "• Video player URLs for streaming\n"
+    "• Progress tracking\n"
+    "• 7-day link validity"
+)
+
+HELP_TEXT = """
 🤖 **Wasabi Upload Bot Help**
 
 **For Users:**
@@ -261,7 +474,15 @@ MP4, MKV, AVI, MOV, WMV, FLV, WebM, M4V, 3GP, MPEG, MPG
 **Player URLs:**
 Video files get special player URLs that work with our Render video player.
 """
-    await message.reply_text(help_text)
+
+# --- Bot Command Handlers ---
+@app.on_message(filters.command("start"))
+async def start_handler(client: Client, message: Message):
+    await message.reply_text(START_TEXT.format(user_id=message.from_user.id))
+
+@app.on_message(filters.command("help"))
+async def help_handler(client: Client, message: Message):
+    await message.reply_text(HELP_TEXT)
 
 @app.on_message(filters.command("adduser"))
 @is_admin
@@ -278,7 +499,7 @@ async def add_user_handler(client: Client, message: Message):
 async def remove_user_handler(client: Client, message: Message):
     try:
         user_id_to_remove = int(message.text.split(" ", 1)[1])
-        if user_id_to_remove == ADMIN_ID:
+        if user_id_to_remove in ADMIN_IDS:
             await message.reply_text("🚫 You cannot remove the admin.")
             return
         if user_id_to_remove in ALLOWED_USERS:
@@ -310,6 +531,14 @@ async def stats_handler(client: Client, message: Message):
     await message.reply_text(stats_text)
 
 # --- File Handling Logic ---
+# (message attribute, fallback name, fallback MIME type) per media type;
+# videos and audio often arrive without a name
+MEDIA_TABLE = {
+    MessageMediaType.DOCUMENT: ("document", "document_{id}", "application/octet-stream"),
+    MessageMediaType.VIDEO: ("video", "video_{id}.mp4", "video/mp4"),
+    MessageMediaType.AUDIO: ("audio", "audio_{id}.mp3", "audio/mpeg"),
+}
+
 @app.on_message(filters.document | filters.video | filters.audio)
 @is_authorized
 async def file_handler(client: Client, message: Message):
@@ -317,9 +546,15 @@ async def file_handler(client: Client, message: Message):
         await message.reply_text("❌ **Error:** Wasabi client is not initialized. Check server logs.")
         return
 
-    media = message.document or message.video or message.audio
-    file_name = media.file_name
+    entry = MEDIA_TABLE.get(message.media)
+    if entry is None:
+        await message.reply_text("❌ **Error:** Unsupported media type.")
+        return
+    attr, default_name, default_mime = entry
+    media = getattr(message, attr)
+    file_name = media.file_name or default_name.format(id=message.id)
     file_size = media.file_size
+    mime_type = media.mime_type or default_mime
     
     # Telegram's limit for bots is 2GB for download, 4GB for upload with MTProto API
     if file_size > 4 * 1024 * 1024 * 1024:
@@ -328,28 +563,19 @@ async def file_handler(client: Client, message: Message):
 
     status_message = await message.reply_text("🚀 Preparing to process your file...")
     
-    # Create unique file path to avoid conflicts
-    timestamp = int(time.time())
-    safe_filename = f"{timestamp}_{file_name}"
-    file_path = f"./downloads/{safe_filename}"
-    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    # Create unique object key to avoid conflicts
+    safe_filename = f"{time.time_ns()}_{secrets.token_hex(4)}_{file_name}"
 
     try:
-        # 1. Download from Telegram
-        await client.download_media(
-            message=message,
-            file_name=file_path,
-            progress=progress_callback,
-            progress_args=(status_message, "Downloading...")
-        )
-        await status_message.edit_text("✅ Download complete. Starting upload to Wasabi...")
-
-        # 2. Upload to Wasabi
-        await upload_to_wasabi(file_path, safe_filename, status_message)
-        await status_message.edit_text("✅ Upload complete. Generating shareable link...")
+        # 1-2. Stream from Telegram straight into Wasabi
+        await upload_to_wasabi(client, message, safe_filename, file_size, status_message, mime_type)
         
-        # 3. Generate a pre-signed URL (valid for 7 days)
-        presigned_url = await generate_presigned_url(safe_filename)
+        # 3. Generate a pre-signed URL (valid for 7 days) while the interim
+        # status edit is still on its way to Telegram
+        _, presigned_url = await asyncio.gather(
+            edit_interim(status_message, "✅ Upload complete. Generating shareable link..."),
+            generate_presigned_url(safe_filename)
+        )
         
         # 4. Generate player URL for video files - FIXED: using correct function name
         player_url = None
@@ -370,7 +596,7 @@ async def file_handler(client: Client, message: Message):
             if player_url:
                 final_message += f"\n**🎥 Player URL:**\n{player_url}"
             
-            await status_message.edit_text(final_message, disable_web_page_preview=False)
+            await edit_with_retry(status_message, final_message, disable_web_page_preview=False)
         else:
             error_message = (
                 f"✅ **File Uploaded Successfully!**\n\n"
@@ -382,18 +608,11 @@ async def file_handler(client: Client, message: Message):
             if player_url:
                 error_message += f"\n\n**🎥 Player URL:**\n{player_url}"
             
-            await status_message.edit_text(error_message, disable_web_page_preview=False)
+            await edit_with_retry(status_message, error_message, disable_web_page_preview=False)
 
     except Exception as e:
-        logger.error(f"An error occurred during file processing: {e}", exc_info=True)
-        await status_message.edit_text(f"❌ **Upload failed:**\n`{str(e)}`")
-    finally:
-        # 6. Cleanup
-        if os.path.exists(file_path):
-            os.remove(file_path)
-            logger.info(f"Cleaned up local file: {file_path}")
-        if status_message.id in last_update_time:
-             del last_update_time[status_message.id]
+        logger.error("An error occurred during file processing: %s", e, exc_info=True)
+        await edit_with_retry(status_message, f"❌ **Upload failed:**\n`{str(e)}`")
 
 # --- Player URL Generation Command ---
 @app.on_message(filters.command("player"))
@@ -405,7 +624,10 @@ async def player_url_handler(client: Client, message: Message):
         
         # Check if file exists in Wasabi
         try:
-            s3_client.head_object(Bucket=WASABI_BUCKET, Key=filename)
+            await asyncio.get_running_loop().run_in_executor(
+                None,
+                partial(s3_client.head_object, Bucket=WASABI_BUCKET, Key=filename)
+            )
             
             if is_video_file(filename):
                 presigned_url = await generate_presigned_url(filename)
@@ -432,12 +654,12 @@ async def player_url_handler(client: Client, message: Message):
                 await message.reply_text(f"❌ Error accessing file: {e.response['Error']['Message']}")
                 
     except IndexError:
-        await message.reply_text("⚠️ **Usage:** /player `<filename>`\nExample: `/player 1234567890_myvideo.mp4`")
+        await message.reply_text("⚠️ **Usage:** /player `<filename>`\nExample: `/player 1700000000000000000_1a2b3c4d_myvideo.mp4`")
 
 # --- Main Execution ---
 if __name__ == "__main__":
     logger.info("Bot is starting...")
-    logger.info(f"Player base URL: {RENDER_URL}")
-    logger.info(f"Supported video formats: {SUPPORTED_VIDEO_FORMATS}")
+    logger.info("Player base URL: %s", RENDER_URL)
+    logger.info("Supported video formats: %s", SUPPORTED_VIDEO_FORMATS)
     app.run()
     logger.info("Bot has stopped.")
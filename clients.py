@@ -0,0 +1,95 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config as BotoConfig
+
+from config import config
+
+# --- Transfer Settings ---
+# Large uploads are split into parts that are sent concurrently
+PART_SIZE = config.WASABI_PART_SIZE_MB * 1024 * 1024  # 16MB per part by default
+MAX_CONCURRENT_PARTS = config.WASABI_MAX_CONCURRENCY
+
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=PART_SIZE,
+    multipart_chunksize=PART_SIZE,
+    max_concurrency=MAX_CONCURRENT_PARTS,
+    max_io_queue=1000,
+    io_chunksize=1024 * 1024,  # 1MB reads/writes instead of the 256KB default
+    use_threads=True
+)
+# s3transfer reads each part of a non-seekable stream fully into RAM and keeps
+# it until its PUT finishes. It holds at most MAX_IN_MEMORY_PARTS parts, which
+# also caps how many of them upload at once, plus the one being read, so a
+# streamed upload sends MAX_IN_MEMORY_PARTS PUTs in parallel and buffers at most
+# (MAX_IN_MEMORY_PARTS + 1) * PART_SIZE here: 80MB with the defaults (4 x 16MB).
+# Kept separate from MAX_CONCURRENT_PARTS, which only applies to file transfers.
+MAX_IN_MEMORY_PARTS = config.WASABI_STREAM_CONCURRENCY
+TRANSFER_CONFIG.max_in_memory_upload_chunks = MAX_IN_MEMORY_PARTS
+
+# Whole-file transfers block a thread for their full duration, so they get
+# their own pool; short calls (signing, head, list) keep the default executor
+MAX_CONCURRENT_TRANSFERS = 16
+TRANSFER_EXECUTOR = ThreadPoolExecutor(
+    max_workers=MAX_CONCURRENT_TRANSFERS,
+    thread_name_prefix='wasabi-transfer'
+)
+
+# --- Shared Wasabi Client ---
+# An explicit session rather than boto3's lazily created default one, so
+# client construction never races on the module-level default session
+session = boto3.session.Session()
+
+@lru_cache(maxsize=1)
+def get_s3_client():
+    """Return the process-wide Wasabi S3 client, creating it on first use.
+
+    Cached so every caller shares one connection pool; building a client per
+    request would throw away pooled TLS sessions on every call.
+    """
+    return session.client(
+        's3',
+        endpoint_url=f'https://s3.{config.WASABI_REGION}.wasabisys.com',
+        aws_access_key_id=config.WASABI_ACCESS_KEY,
+        aws_secret_access_key=config.WASABI_SECRET_KEY,
+        region_name=config.WASABI_REGION,
+        config=BotoConfig(
+            s3={'addressing_style': 'virtual'},
+            retries={'max_attempts': 5, 'mode': 'adaptive'},
+            # One pooled connection per part of every transfer that can run at
+            # once, so concurrent parts never open fresh TLS sessions
+            max_pool_connections=MAX_CONCURRENT_PARTS * MAX_CONCURRENT_TRANSFERS,
+            tcp_keepalive=True,
+            connect_timeout=5,
+            read_timeout=60
+        )
+    )
+
+# One client (and connection pool) per process. boto3 clients are thread-safe,
+# so handlers and transfer worker threads all share it.
+s3_client = get_s3_client()
+
+# --- Presigned URLs ---
+# A signed URL is reused for at most an hour and never for more than half its
+# lifetime, so a link handed out always has most of its validity left
+PRESIGNED_URL_REUSE = 3600
+
+@lru_cache(maxsize=10000)
+def _presign(bucket, key, expires_in, window):
+    """Sign a GET URL; cached per (bucket, key, expiry, reuse window)."""
+    return s3_client.generate_presigned_url(
+        'get_object',
+        Params={'Bucket': bucket, 'Key': key},
+        ExpiresIn=expires_in
+    )
+
+def presign_get_url(bucket, key, expires_in):
+    """Return a presigned GET URL for key, reusing one from the current window.
+
+    Signing may refresh credentials, so call this from an executor.
+    """
+    reuse = max(min(PRESIGNED_URL_REUSE, expires_in // 2), 1)
+    return _presign(bucket, key, expires_in, int(time.time()) // reuse)
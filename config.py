@@ -13,9 +13,30 @@ class Config:
     WASABI_SECRET_KEY = os.environ.get("WASABI_SECRET_KEY")
     WASABI_BUCKET = os.environ.get("WASABI_BUCKET")
     WASABI_REGION = os.environ.get("WASABI_REGION")
+    # Multipart part size; whole MB so parts line up with Telegram's 1MB chunks
+    WASABI_PART_SIZE_MB = int(os.environ.get("WASABI_PART_SIZE_MB", 16))
+    # Parts in flight for file-backed WasabiClient transfers, and the connection
+    # pool multiplier; streamed bot uploads use WASABI_STREAM_CONCURRENCY
+    WASABI_MAX_CONCURRENCY = int(os.environ.get("WASABI_MAX_CONCURRENCY", 10))
+    # Parts of a streamed Telegram upload in flight (and held in memory) at once
+    WASABI_STREAM_CONCURRENCY = int(os.environ.get("WASABI_STREAM_CONCURRENCY", 4))
+    # S3 multipart parts must be 5MB-5GB, and streamed uploads buffer a few
+    # whole parts in memory, so reject a bad size here rather than mid-upload
+    if not 5 <= WASABI_PART_SIZE_MB <= 5120:
+        raise ValueError(f"WASABI_PART_SIZE_MB must be between 5 and 5120, got {WASABI_PART_SIZE_MB}")
+    if WASABI_MAX_CONCURRENCY < 1:
+        raise ValueError(f"WASABI_MAX_CONCURRENCY must be at least 1, got {WASABI_MAX_CONCURRENCY}")
+    if WASABI_STREAM_CONCURRENCY < 1:
+        raise ValueError(f"WASABI_STREAM_CONCURRENCY must be at least 1, got {WASABI_STREAM_CONCURRENCY}")
+    # Memory (MB) that concurrent Telegram-to-Wasabi uploads may buffer in total
+    UPLOAD_MEMORY_BUDGET_MB = int(os.environ.get("UPLOAD_MEMORY_BUDGET_MB", 256))
     
     # Admin Configuration
     ADMIN_ID = int(os.environ.get("ADMIN_ID", 0))
+    # Comma-separated ADMIN_IDS (as render.yaml sets) plus the single ADMIN_ID
+    ADMIN_IDS = frozenset(
+        int(x) for x in os.environ.get("ADMIN_IDS", "").split(",") if x.strip()
+    ) | (frozenset((ADMIN_ID,)) if ADMIN_ID else frozenset())
     
     # Web Server Configuration
     WEB_SERVER_URL = os.environ.get("WEB_SERVER_URL", "http://localhost:8000")
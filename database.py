@@ -1,12 +1,16 @@
 import sqlite3
 import logging
 from datetime import datetime
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
 class Database:
     def __init__(self, db_path="files.db"):
         self.db_path = db_path
+        # Callback buttons look the same record up again and again; serve
+        # repeats from memory instead of reopening the database
+        self._cached_file = lru_cache(maxsize=4096)(self._fetch_file)
         self.init_db()
     
     def init_db(self):
@@ -52,15 +56,21 @@ class Database:
             ))
             
             conn.commit()
+            # A lookup made before the insert may have cached None
+            self._cached_file.cache_clear()
             return True
         except sqlite3.IntegrityError:
-            logger.warning(f"File ID {file_data['file_id']} already exists")
+            logger.warning("File ID %s already exists", file_data['file_id'])
             return False
         finally:
             conn.close()
     
     def get_file(self, file_id):
         """Get file record by file_id"""
+        return self._cached_file(file_id)
+    
+    def _fetch_file(self, file_id):
+        """Read a file record from the database"""
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
@@ -126,6 +136,7 @@ class Database:
         cursor.execute('DELETE FROM files WHERE file_id = ?', (file_id,))
         conn.commit()
         conn.close()
+        self._cached_file.cache_clear()
         
         return cursor.rowcount > 0
 
@@ -1,5 +1,6 @@
 import logging
 import os
+from urllib.parse import urlsplit
 from pyrogram import Client, filters
 from pyrogram.types import Message, CallbackQuery
 from pyrogram.errors import SessionPasswordNeeded
@@ -20,6 +21,49 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# --- Static Bot Messages ---
+# Built once at import rather than on every /start or /help
+WELCOME_TEXT = (
+    "🤖 **Welcome to File Storage Bot!**\n\n"
+    "**Features:**\n"
+    "✅ Store files up to 4GB\n"
+    "✅ Wasabi Cloud Storage\n"
+    "✅ Direct streaming links\n"
+    "✅ MX Player & VLC support\n"
+    "✅ Mobile optimized\n\n"
+    "**Available Commands:**\n"
+    "📤 /upload - Upload a file\n"
+    "📥 /download <id> - Download file\n"
+    "📺 /stream <id> - Stream file\n"
+    "📋 /list - List your files\n"
+    "🔄 /test - Test Wasabi connection\n"
+    "🌐 /web <id> - Web player link\n"
+    "ℹ️ /help - Show help\n\n"
+    "**Quick Start:** Just send me any file to upload!"
+)
+
+HELP_TEXT = (
+    "🤖 **File Storage Bot Help**\n\n"
+    "**Basic Usage:**\n"
+    "1. Send any file to upload automatically\n"
+    "2. Use /upload command for manual upload\n"
+    "3. Use /list to see your uploaded files\n"
+    "4. Use /download <id> or /stream <id> to access files\n\n"
+    "**Supported File Types:**\n"
+    "📄 Documents (PDF, DOC, etc.)\n"
+    "🎬 Videos (MP4, MKV, AVI, etc.)\n"
+    "🎵 Audio (MP3, WAV, etc.)\n"
+    "🖼️ Images (JPG, PNG, etc.)\n\n"
+    "**Streaming Support:**\n"
+    "🎬 MX Player (Android)\n"
+    "🔵 VLC Player (All platforms)\n"
+    "🌐 Web Browser\n\n"
+    "**File Size Limit:** 4GB\n"
+    "**Storage:** Wasabi Cloud (Secure & Reliable)"
+)
+
+MAIN_KEYBOARD = get_main_keyboard()
+
 class TelegramFileBot:
     def __init__(self):
         # Check if session file exists, if not we'll create it
@@ -41,28 +85,9 @@ class TelegramFileBot:
         # Start command
         @self.app.on_message(filters.command("start"))
         async def start_command(client, message: Message):
-            welcome_text = (
-                "🤖 **Welcome to File Storage Bot!**\n\n"
-                "**Features:**\n"
-                "✅ Store files up to 4GB\n"
-                "✅ Wasabi Cloud Storage\n"
-                "✅ Direct streaming links\n"
-                "✅ MX Player & VLC support\n"
-                "✅ Mobile optimized\n\n"
-                "**Available Commands:**\n"
-                "📤 /upload - Upload a file\n"
-                "📥 /download <id> - Download file\n"
-                "📺 /stream <id> - Stream file\n"
-                "📋 /list - List your files\n"
-                "🔄 /test - Test Wasabi connection\n"
-                "🌐 /web <id> - Web player link\n"
-                "ℹ️ /help - Show help\n\n"
-                "**Quick Start:** Just send me any file to upload!"
-            )
-            
             await message.reply_text(
-                welcome_text,
-                reply_markup=get_main_keyboard()
+                WELCOME_TEXT,
+                reply_markup=MAIN_KEYBOARD
             )
         
         # Upload command
@@ -137,27 +162,7 @@ class TelegramFileBot:
         # Help command
         @self.app.on_message(filters.command("help"))
         async def help_command(client, message: Message):
-            help_text = (
-                "🤖 **File Storage Bot Help**\n\n"
-                "**Basic Usage:**\n"
-                "1. Send any file to upload automatically\n"
-                "2. Use /upload command for manual upload\n"
-                "3. Use /list to see your uploaded files\n"
-                "4. Use /download <id> or /stream <id> to access files\n\n"
-                "**Supported File Types:**\n"
-                "📄 Documents (PDF, DOC, etc.)\n"
-                "🎬 Videos (MP4, MKV, AVI, etc.)\n"
-                "🎵 Audio (MP3, WAV, etc.)\n"
-                "🖼️ Images (JPG, PNG, etc.)\n\n"
-                "**Streaming Support:**\n"
-                "🎬 MX Player (Android)\n"
-                "🔵 VLC Player (All platforms)\n"
-                "🌐 Web Browser\n\n"
-                "**File Size Limit:** 4GB\n"
-                "**Storage:** Wasabi Cloud (Secure & Reliable)"
-            )
-            
-            await message.reply(help_text)
+            await message.reply(HELP_TEXT)
         
         # Handle file messages (automatic upload)
         @self.app.on_message(
@@ -167,90 +172,102 @@ class TelegramFileBot:
         async def handle_file_message(client, message: Message):
             await FileHandler.handle_file_upload(client, message)
         
+        # Callback actions, one per callback_data prefix
+        async def on_download(client, callback_query, file_id):
+            await FileHandler.handle_file_download(client, callback_query.message, file_id)
+        
+        async def on_stream(client, callback_query, file_id):
+            await FileHandler.handle_file_stream(client, callback_query.message, file_id)
+        
+        async def on_mxplayer(client, callback_query, file_id):
+            file_info = db.get_file(file_id)
+            
+            if file_info:
+                url_result = await wasabi_client.generate_presigned_url(file_info['wasabi_key'])
+                if url_result['success']:
+                    u = urlsplit(url_result['url'])
+                    mx_url = f"intent://{u.netloc}{u.path}?{u.query}#Intent;package=com.mxtech.videoplayer.ad;scheme={u.scheme};end"
+                    await callback_query.message.reply(
+                        f"🎬 **MX Player**\n\nClick below to open in MX Player:",
+                        reply_markup=InlineKeyboardMarkup([
+                            [InlineKeyboardButton("🎬 Open in MX Player", url=mx_url)]
+                        ])
+                    )
+        
+        async def on_vlc(client, callback_query, file_id):
+            file_info = db.get_file(file_id)
+            
+            if file_info:
+                url_result = await wasabi_client.generate_presigned_url(file_info['wasabi_key'])
+                if url_result['success']:
+                    vlc_url = f"vlc://{url_result['url']}"
+                    await callback_query.message.reply(
+                        f"🔵 **VLC Player**\n\nClick below to open in VLC:",
+                        reply_markup=InlineKeyboardMarkup([
+                            [InlineKeyboardButton("🔵 Open in VLC", url=vlc_url)]
+                        ])
+                    )
+        
+        async def on_delete(client, callback_query, file_id):
+            file_info = db.get_file(file_id)
+            
+            if file_info and file_info['user_id'] == callback_query.from_user.id:
+                await callback_query.message.edit_text(
+                    f"🗑️ **Delete File**\n\n"
+                    f"Are you sure you want to delete:\n`{file_info['file_name']}`?",
+                    reply_markup=get_confirmation_keyboard(file_id)
+                )
+        
+        async def on_confirm_delete(client, callback_query, file_id):
+            file_info = db.get_file(file_id)
+            
+            if file_info and file_info['user_id'] == callback_query.from_user.id:
+                # Delete from Wasabi
+                await wasabi_client.delete_file(file_info['wasabi_key'])
+                # Delete from database
+                db.delete_file(file_id)
+                
+                await callback_query.message.edit_text(
+                    f"✅ **File Deleted**\n\n`{file_info['file_name']}` has been permanently deleted."
+                )
+        
+        async def on_cancel_delete(client, callback_query, file_id):
+            file_info = db.get_file(file_id)
+            
+            if file_info:
+                await callback_query.message.edit_text(
+                    f"❌ **Deletion Cancelled**\n\n`{file_info['file_name']}` was not deleted.",
+                    reply_markup=get_file_options_keyboard(file_id)
+                )
+        
+        # Keyed by the text before the first "_"; the full prefix is stripped
+        # to get the file ID, which may itself contain underscores
+        callback_actions = {
+            "download": ("download_", on_download),
+            "stream": ("stream_", on_stream),
+            "mxplayer": ("mxplayer_", on_mxplayer),
+            "vlc": ("vlc_", on_vlc),
+            "delete": ("delete_", on_delete),
+            "confirm": ("confirm_delete_", on_confirm_delete),
+            "cancel": ("cancel_delete_", on_cancel_delete),
+        }
+        
         # Callback query handler
         @self.app.on_callback_query()
         async def handle_callback(client, callback_query: CallbackQuery):
             data = callback_query.data
-            user_id = callback_query.from_user.id
             
             try:
-                if data.startswith("download_"):
-                    file_id = data.replace("download_", "")
-                    await FileHandler.handle_file_download(client, callback_query.message, file_id)
-                
-                elif data.startswith("stream_"):
-                    file_id = data.replace("stream_", "")
-                    await FileHandler.handle_file_stream(client, callback_query.message, file_id)
-                
-                elif data.startswith("mxplayer_"):
-                    file_id = data.replace("mxplayer_", "")
-                    file_info = db.get_file(file_id)
-                    
-                    if file_info:
-                        url_result = await wasabi_client.generate_presigned_url(file_info['wasabi_key'])
-                        if url_result['success']:
-                            mx_url = f"intent://{url_result['url']}#Intent;package=com.mxtech.videoplayer.ad;scheme=http;end"
-                            await callback_query.message.reply(
-                                f"🎬 **MX Player**\n\nClick below to open in MX Player:",
-                                reply_markup=InlineKeyboardMarkup([
-                                    [InlineKeyboardButton("🎬 Open in MX Player", url=mx_url)]
-                                ])
-                            )
-                
-                elif data.startswith("vlc_"):
-                    file_id = data.replace("vlc_", "")
-                    file_info = db.get_file(file_id)
-                    
-                    if file_info:
-                        url_result = await wasabi_client.generate_presigned_url(file_info['wasabi_key'])
-                        if url_result['success']:
-                            vlc_url = f"vlc://{url_result['url']}"
-                            await callback_query.message.reply(
-                                f"🔵 **VLC Player**\n\nClick below to open in VLC:",
-                                reply_markup=InlineKeyboardMarkup([
-                                    [InlineKeyboardButton("🔵 Open in VLC", url=vlc_url)]
-                                ])
-                            )
-                
-                elif data.startswith("delete_"):
-                    file_id = data.replace("delete_", "")
-                    file_info = db.get_file(file_id)
-                    
-                    if file_info and file_info['user_id'] == user_id:
-                        await callback_query.message.edit_text(
-                            f"🗑️ **Delete File**\n\n"
-                            f"Are you sure you want to delete:\n`{file_info['file_name']}`?",
-                            reply_markup=get_confirmation_keyboard(file_id)
-                        )
-                
-                elif data.startswith("confirm_delete_"):
-                    file_id = data.replace("confirm_delete_", "")
-                    file_info = db.get_file(file_id)
-                    
-                    if file_info and file_info['user_id'] == user_id:
-                        # Delete from Wasabi
-                        await wasabi_client.delete_file(file_info['wasabi_key'])
-                        # Delete from database
-                        db.delete_file(file_id)
-                        
-                        await callback_query.message.edit_text(
-                            f"✅ **File Deleted**\n\n`{file_info['file_name']}` has been permanently deleted."
-                        )
-                
-                elif data.startswith("cancel_delete_"):
-                    file_id = data.replace("cancel_delete_", "")
-                    file_info = db.get_file(file_id)
-                    
-                    if file_info:
-                        await callback_query.message.edit_text(
-                            f"❌ **Deletion Cancelled**\n\n`{file_info['file_name']}` was not deleted.",
-                            reply_markup=get_file_options_keyboard(file_id)
-                        )
+                entry = callback_actions.get(data.partition("_")[0])
+                if entry is not None:
+                    prefix, action = entry
+                    if data.startswith(prefix):
+                        await action(client, callback_query, data.removeprefix(prefix))
                 
                 await callback_query.answer()
                 
             except Exception as e:
-                logger.error(f"Callback error: {e}")
+                logger.error("Callback error: %s", e)
                 await callback_query.answer("❌ An error occurred", show_alert=True)
     
     async def start(self):
@@ -263,7 +280,7 @@ class TelegramFileBot:
         if test_result['success']:
             logger.info("✅ Wasabi connection successful")
         else:
-            logger.error(f"❌ Wasabi connection failed: {test_result['error']}")
+            logger.error("❌ Wasabi connection failed: %s", test_result['error'])
             return
         
         # Start the bot
@@ -272,7 +289,7 @@ class TelegramFileBot:
         
         # Get bot info to confirm it's working
         me = await self.app.get_me()
-        logger.info(f"✅ Bot started successfully as: {me.first_name} (@{me.username})")
+        logger.info("✅ Bot started successfully as: %s (@%s)", me.first_name, me.username)
         
         # Keep the bot running
         await self.app.idle()
@@ -1,19 +1,19 @@
-import boto3
+import os
+import asyncio
 import logging
+from functools import partial
 from botocore.exceptions import ClientError
 from config import config
+from clients import TRANSFER_CONFIG, TRANSFER_EXECUTOR, presign_get_url, s3_client
 
 logger = logging.getLogger(__name__)
 
+# S3 DeleteObjects accepts at most 1000 keys per request
+DELETE_BATCH_SIZE = 1000
+
 class WasabiClient:
     def __init__(self):
-        self.s3_client = boto3.client(
-            's3',
-            aws_access_key_id=config.WASABI_ACCESS_KEY,
-            aws_secret_access_key=config.WASABI_SECRET_KEY,
-            endpoint_url=config.WASABI_ENDPOINT,
-            region_name=config.WASABI_REGION
-        )
+        self.s3_client = s3_client
         self.bucket = config.WASABI_BUCKET
     
     async def upload_file(self, file_path, object_name=None):
@@ -22,13 +22,29 @@ class WasabiClient:
             if object_name is None:
                 object_name = file_path.split('/')[-1]
             
-            self.s3_client.upload_file(file_path, self.bucket, object_name)
+            # boto3 blocks for the whole transfer, so run it (and the signing)
+            # in a worker thread; TRANSFER_CONFIG uploads the parts concurrently.
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(
+                TRANSFER_EXECUTOR,
+                partial(
+                    self.s3_client.upload_file,
+                    file_path,
+                    self.bucket,
+                    object_name,
+                    Config=TRANSFER_CONFIG
+                )
+            )
             
             # Generate presigned URL for download/streaming
-            url = self.s3_client.generate_presigned_url(
-                'get_object',
-                Params={'Bucket': self.bucket, 'Key': object_name},
-                ExpiresIn=3600 * 24 * 7  # 7 days
+            url = await loop.run_in_executor(
+                None,
+                partial(
+                    self.s3_client.generate_presigned_url,
+                    'get_object',
+                    Params={'Bucket': self.bucket, 'Key': object_name},
+                    ExpiresIn=3600 * 24 * 7  # 7 days
+                )
             )
             
             return {
@@ -38,31 +54,75 @@ class WasabiClient:
                 'size': os.path.getsize(file_path)
             }
         except ClientError as e:
-            logger.error(f"Wasabi upload error: {e}")
+            logger.error("Wasabi upload error: %s", e)
             return {'success': False, 'error': str(e)}
     
     async def download_file(self, object_name, file_path):
         """Download a file from Wasabi storage"""
         try:
-            self.s3_client.download_file(self.bucket, object_name, file_path)
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(
+                TRANSFER_EXECUTOR,
+                partial(
+                    self.s3_client.download_file,
+                    self.bucket,
+                    object_name,
+                    file_path,
+                    Config=TRANSFER_CONFIG
+                )
+            )
             return {'success': True, 'file_path': file_path}
         except ClientError as e:
-            logger.error(f"Wasabi download error: {e}")
+            logger.error("Wasabi download error: %s", e)
             return {'success': False, 'error': str(e)}
     
     async def delete_file(self, object_name):
         """Delete a file from Wasabi storage"""
         try:
-            self.s3_client.delete_object(Bucket=self.bucket, Key=object_name)
+            await asyncio.get_running_loop().run_in_executor(
+                None,
+                partial(self.s3_client.delete_object, Bucket=self.bucket, Key=object_name)
+            )
             return {'success': True}
         except ClientError as e:
-            logger.error(f"Wasabi delete error: {e}")
+            logger.error("Wasabi delete error: %s", e)
+            return {'success': False, 'error': str(e)}
+    
+    async def delete_files_bulk(self, object_names):
+        """Delete many files from Wasabi storage, up to 1000 per request"""
+        try:
+            loop = asyncio.get_running_loop()
+            errors = []
+            for i in range(0, len(object_names), DELETE_BATCH_SIZE):
+                batch = object_names[i:i + DELETE_BATCH_SIZE]
+                response = await loop.run_in_executor(
+                    None,
+                    partial(
+                        self.s3_client.delete_objects,
+                        Bucket=self.bucket,
+                        Delete={
+                            'Objects': [{'Key': name} for name in batch],
+                            'Quiet': True
+                        }
+                    )
+                )
+                errors.extend(response.get('Errors', []))
+            if errors:
+                message = "; ".join(f"{err['Key']}: {err['Message']}" for err in errors)
+                logger.error("Wasabi bulk delete error: %s", message)
+                return {'success': False, 'error': message, 'failed': errors}
+            return {'success': True}
+        except ClientError as e:
+            logger.error("Wasabi bulk delete error: %s", e)
             return {'success': False, 'error': str(e)}
     
     async def list_files(self):
         """List all files in Wasabi bucket"""
         try:
-            response = self.s3_client.list_objects_v2(Bucket=self.bucket)
+            response = await asyncio.get_running_loop().run_in_executor(
+                None,
+                partial(self.s3_client.list_objects_v2, Bucket=self.bucket)
+            )
             files = []
             if 'Contents' in response:
                 for obj in response['Contents']:
@@ -73,26 +133,27 @@ class WasabiClient:
                     })
             return {'success': True, 'files': files}
         except ClientError as e:
-            logger.error(f"Wasabi list error: {e}")
+            logger.error("Wasabi list error: %s", e)
             return {'success': False, 'error': str(e)}
     
     async def generate_presigned_url(self, object_name, expires_in=3600):
         """Generate presigned URL for streaming"""
         try:
-            url = self.s3_client.generate_presigned_url(
-                'get_object',
-                Params={'Bucket': self.bucket, 'Key': object_name},
-                ExpiresIn=expires_in
+            url = await asyncio.get_running_loop().run_in_executor(
+                None, presign_get_url, self.bucket, object_name, expires_in
             )
             return {'success': True, 'url': url}
         except ClientError as e:
-            logger.error(f"Wasabi URL generation error: {e}")
+            logger.error("Wasabi URL generation error: %s", e)
             return {'success': False, 'error': str(e)}
     
     async def test_connection(self):
         """Test Wasabi connection"""
         try:
-            self.s3_client.head_bucket(Bucket=self.bucket)
+            await asyncio.get_running_loop().run_in_executor(
+                None,
+                partial(self.s3_client.head_bucket, Bucket=self.bucket)
+            )
             return {'success': True, 'message': 'Wasabi connection successful'}
         except ClientError as e:
             return {'success': False, 'error': str(e)}
@@ -1,25 +1,13 @@
 from flask import Flask, render_template, request, jsonify
-import boto3
 from botocore.exceptions import ClientError
 from config import config
+from clients import presign_get_url
 import os
 
 app = Flask(__name__)
 
 # Wasabi configuration
-WASABI_ACCESS_KEY = config.WASABI_ACCESS_KEY
-WASABI_SECRET_KEY = config.WASABI_SECRET_KEY
 WASABI_BUCKET = config.WASABI_BUCKET
-WASABI_REGION = config.WASABI_REGION
-
-# Initialize S3 client
-s3_client = boto3.client(
-    's3',
-    endpoint_url=f'https://s3.{WASABI_REGION}.wasabisys.com',
-    aws_access_key_id=WASABI_ACCESS_KEY,
-    aws_secret_access_key=WASABI_SECRET_KEY,
-    region_name=WASABI_REGION
-)
 
 @app.route('/')
 def index():
@@ -33,11 +21,7 @@ def player():
     
     # Generate presigned URL for the video
     try:
-        presigned_url = s3_client.generate_presigned_url(
-            'get_object',
-            Params={'Bucket': WASABI_BUCKET, 'Key': file_key},
-            ExpiresIn=3600  # 1 hour
-        )
+        presigned_url = presign_get_url(WASABI_BUCKET, file_key, 3600)  # 1 hour
     except ClientError as e:
         return f"Error accessing file: {e}", 404
     